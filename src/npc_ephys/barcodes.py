@@ -55,6 +55,7 @@ def extract_barcodes_from_times(
     Notes
     -----
     ignores first on pulse (intended - this is needed to identify that a barcode is starting)
+    on_times and off_times are assumed to be in ascending order
     """
     if len(on_times) > len(off_times):
         on_times = on_times[:-1]
@@ -74,17 +75,20 @@ def extract_barcodes_from_times(
 
     barcodes = []
 
-    for _i, t in enumerate(barcode_start_times):
-        oncode = on_times[
-            np.where(
-                np.logical_and(on_times > t, on_times < t + barcode_duration_ceiling)
-            )[0]
-        ]
-        offcode = off_times[
-            np.where(
-                np.logical_and(off_times > t, off_times < t + barcode_duration_ceiling)
-            )[0]
-        ]
+    # edge times are sorted, so each barcode's edges are a contiguous slice: find
+    # the bounds by binary search instead of comparing against every edge
+    on_start_idx = np.searchsorted(on_times, barcode_start_times, side="right")
+    on_stop_idx = np.searchsorted(
+        on_times, barcode_start_times + barcode_duration_ceiling, side="left"
+    )
+    off_start_idx = np.searchsorted(off_times, barcode_start_times, side="right")
+    off_stop_idx = np.searchsorted(
+        off_times, barcode_start_times + barcode_duration_ceiling, side="left"
+    )
+
+    for i, t in enumerate(barcode_start_times):
+        oncode = on_times[on_start_idx[i] : on_stop_idx[i]]
+        offcode = off_times[off_start_idx[i] : off_stop_idx[i]]
 
         currTime = offcode[0]
 
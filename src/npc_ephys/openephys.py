@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
+import ast
 import dataclasses
-import io
+import fnmatch
+import functools
 import json
 import logging
 import re
-from collections.abc import Generator, Iterable, Sequence
+from collections.abc import Generator, Iterable, Iterator, MutableMapping, Sequence
 from typing import Any, Literal, Protocol
 
+import fsspec
 import npc_io
 import npc_sync
 import numpy as np
@@ -24,6 +27,16 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_PROBES = "ABCDEF"
 
+_NPY_HEADER_PREFETCH_BYTES = 4096
+"""Bytes read from the start of a .npy file to capture its header in one request"""
+
+_EXPERIMENT_RE = re.compile(r".*(experiment\d+)")
+_RECORD_NODE_RE = re.compile(r".*(Record Node \d+)")
+_SYNC_MESSAGE_RE = re.compile(
+    r"Start Time for (.+?) \((\d+)\) - (.+?) @ (\d+) Hz:\s*(\d+)"
+)
+"""Groups: processor name, processor id, stream name, sample rate, start sample"""
+
 
 def get_sync_messages_data(
     sync_messages_path: npc_io.PathLike,
@@ -38,33 +51,31 @@ def get_sync_messages_data(
     >>> dirname_to_sample['NI-DAQmx-105.PXI-6133']
     {'start': 257417001, 'rate': 30000}
     """
+    path = npc_io.from_pathlike(sync_messages_path)
+    # copy so that callers can't modify the cached data
+    return {
+        label: dict(data)
+        for label, data in _get_sync_messages_data_cached(
+            path.as_posix(), path.fs
+        ).items()
+    }
 
-    def label(line) -> str:
-        return "".join(
-            line.split("Start Time for ")[-1]
-            .split(" @")[0]
-            .replace(") - ", ".")
-            .replace(" (", "-")
-        )
-
-    def start(line) -> int:
-        return int(line.strip(" ").split("Hz:")[-1])
-
-    def rate(line) -> int:
-        return int(line.split("@ ")[-1].split(" Hz")[0])
 
+@functools.lru_cache(maxsize=256)
+def _get_sync_messages_data_cached(
+    path: str, fs: fsspec.AbstractFileSystem
+) -> dict[str, dict[Literal["start", "rate"], int]]:
+    # first line ("Software Time...") doesn't match, so no need to split lines
     return {
-        label(line): {
-            "start": start(line),
-            "rate": rate(line),
+        f"{m[1]}-{m[2]}.{m[3]}": {
+            "start": int(m[5]),
+            "rate": int(m[4]),
         }
-        for line in npc_io.from_pathlike(sync_messages_path)
-        .read_text()
-        .splitlines()[1:]
+        for m in _SYNC_MESSAGE_RE.finditer(fs.cat_file(path).decode())
     }
 
 
-@dataclasses.dataclass(frozen=True, eq=True, unsafe_hash=True)
+@dataclasses.dataclass(frozen=True, eq=False)
 class EphysDeviceInfo:
     name: str
     continuous: upath.UPath
@@ -83,7 +94,16 @@ class EphysDeviceInfo:
 
     @npc_io.cached_property
     def num_samples(self) -> int:
-        return get_ephys_data(self.continuous.parent.parent, device=self).shape[0]
+        return _get_num_samples(self)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, EphysDeviceInfo):
+            return NotImplemented
+        # name and path identify the device: no need to compare arrays of ttl data
+        return self.name == other.name and self.continuous == other.continuous
+
+    def __hash__(self) -> int:
+        return hash((self.name, self.continuous.as_posix()))
 
 
 class EphysTimingInfo(Protocol):
@@ -123,6 +143,11 @@ class EphysTimingInfoOnPXI:
         """Simple length of recording using nominal sample rate"""
         return self.start_time + (self.device.num_samples / self.sampling_rate)
 
+    @npc_io.cached_property
+    def ttl_times(self) -> npt.NDArray[np.float64]:
+        """TTL sample numbers converted to seconds using nominal sample rate"""
+        return self.device.ttl_sample_numbers / self.sampling_rate
+
 
 @dataclasses.dataclass(frozen=True, eq=True, unsafe_hash=True)
 class EphysTimingInfoOnSync:
@@ -139,6 +164,66 @@ class EphysTimingInfoOnSync:
         return self.start_time + (self.device.num_samples / self.sampling_rate)
 
 
+def _read_npy_header(
+    path: upath.UPath,
+) -> tuple[int, np.dtype, tuple[int, ...], bool]:
+    """Byte offset of array data, dtype, shape and fortran order from the header of a
+    .npy file."""
+    return _read_npy_header_cached(path.as_posix(), path.fs)
+
+
+@functools.lru_cache(maxsize=1024)
+def _read_npy_header_cached(
+    path: str, fs: fsspec.AbstractFileSystem
+) -> tuple[int, np.dtype, tuple[int, ...], bool]:
+    # a single request covers magic string, version, header length and header in
+    # almost all cases: only fetch again if the header is unusually large
+    prefetch = fs.read_bytes(path, start=0, end=_NPY_HEADER_PREFETCH_BYTES)
+    if _get_npy_array_start(prefetch) > len(prefetch):
+        prefetch = fs.read_bytes(path, start=0, end=_get_npy_array_start(prefetch))
+    return _parse_npy_header(prefetch)
+
+
+def _get_npy_array_start(buffer: bytes) -> int:
+    """Byte offset of array data in a .npy file, from the first 12 bytes."""
+    header_len_stop = 10 if buffer[6] == 1 else 12
+    return header_len_stop + int.from_bytes(buffer[8:header_len_stop], "little")
+
+
+def _parse_npy_header(
+    buffer: bytes,
+) -> tuple[int, np.dtype, tuple[int, ...], bool]:
+    """Byte offset of array data, dtype, shape and fortran order from a buffer
+    containing at least the complete header of a .npy file."""
+    ver_major = buffer[6]
+    header_len_stop = 10 if ver_major == 1 else 12
+    array_start = _get_npy_array_start(buffer)
+    if array_start > len(buffer):
+        raise ValueError(
+            f"Buffer of {len(buffer)} bytes does not contain complete .npy header ({array_start} bytes)"
+        )
+    header = ast.literal_eval(
+        buffer[header_len_stop:array_start]
+        .decode("latin1" if ver_major < 3 else "utf-8")
+        .strip()
+    )
+    return (
+        array_start,
+        np.dtype(header["descr"]),
+        tuple(header["shape"]),
+        header["fortran_order"],
+    )
+
+
+def _array_from_npy_bytes(buffer: bytes) -> npt.NDArray:
+    """Array backed by the complete contents of a .npy file, without copying the data
+    (unlike `np.load(io.BytesIO(buffer))`): read-only if `buffer` is immutable."""
+    array_start, dtype, shape, fortran_order = _parse_npy_header(buffer)
+    return np.frombuffer(buffer, dtype=dtype, offset=array_start).reshape(
+        shape, order="F" if fortran_order else "C"
+    )
+
+
 def read_array_range_from_npy(
     path: npc_io.PathLike, _range: int | slice
 ) -> npt.NDArray:
@@ -146,17 +231,9 @@ def read_array_range_from_npy(
     if not isinstance(_range, slice):
         _range = slice(_range, _range + 1)
     path = npc_io.from_pathlike(path)
-    ver_major = int.from_bytes(path.fs.read_bytes(path, start=6, end=7), "little")
-    header_len_stop = 10 if ver_major == 1 else 12
-    header_len = int.from_bytes(
-        path.fs.read_bytes(path, start=8, end=header_len_stop), "little"
-    )
-    array_start = header_len_stop + header_len
-    header_bytes = path.fs.read_bytes(path, start=header_len_stop, end=array_start)
-    header = eval(header_bytes.decode("utf-8").strip("\n").strip())
-    assert len(header["shape"]) == 1, "Currently supporting 1-D array only"
-    dtype = header["descr"]
-    num_bytes_per_value = np.dtype(dtype).itemsize
+    array_start, dtype, shape, _ = _read_npy_header(path)
+    assert len(shape) == 1, "Currently supporting 1-D array only"
+    num_bytes_per_value = dtype.itemsize
     return np.frombuffer(
         path.fs.read_bytes(
             path,
@@ -167,11 +244,116 @@ def read_array_range_from_npy(
     )
 
 
+def _get_device_paths(
+    recording_dir: upath.UPath,
+    devices: Iterable[str],
+    only_devices_including: str | None = None,
+    refresh: bool = False,
+) -> dict[str, tuple[upath.UPath, upath.UPath, upath.UPath]]:
+    """Continuous, events and TTL paths for each device with data in `recording_dir`:
+    devices without a TTL folder are skipped, with a warning."""
+    # a single listing of the recording dir replaces an `exists()` and a `glob()`
+    # per device
+    dir_to_subdir_names: dict[str, set[str]] = {}
+    for relative_path in _walk(recording_dir, refresh=refresh):
+        parts = relative_path.split("/")
+        for idx in range(1, len(parts) - 1):
+            dir_to_subdir_names.setdefault("/".join(parts[:idx]), set()).add(parts[idx])
+    device_to_paths: dict[str, tuple[upath.UPath, upath.UPath, upath.UPath]] = {}
+    for device in devices:
+        if (
+            only_devices_including
+            and only_devices_including.lower() not in device.lower()
+        ):
+            continue
+        if device not in dir_to_subdir_names.get("continuous", ()):
+            continue
+        continuous = recording_dir / "continuous" / device
+        events = recording_dir / "events" / device
+        ttl_name = next(
+            (
+                name
+                for name in sorted(dir_to_subdir_names.get(f"events/{device}", ()))
+                if fnmatch.fnmatch(name, "TTL*")
+            ),
+            None,
+        )
+        if ttl_name is None:
+            logger.warning(f"Skipping {device}: no TTL* folder found in {events}")
+            continue
+        device_to_paths[device] = (continuous, events, events / ttl_name)
+    return device_to_paths
+
+
+def _cat_device_npy_files(
+    fs: fsspec.AbstractFileSystem,
+    device_to_paths: dict[str, tuple[upath.UPath, upath.UPath, upath.UPath]],
+    trust_sync_messages: bool = False,
+) -> Generator[bytes, None, None]:
+    """Contents of ttl/sample_numbers.npy and ttl/states.npy for each device in turn,
+    each followed by the start of continuous/sample_numbers.npy if
+    `trust_sync_messages` is False."""
+    # fetch npy files for all devices concurrently (sequential requests are
+    # slow for remote storage)
+    npy_paths: list[str] = []
+    starts: list[int] = []
+    ends: list[int | None] = []
+    for continuous, _, ttl in device_to_paths.values():
+        npy_paths.extend(
+            (
+                (ttl / "sample_numbers.npy").as_posix(),
+                (ttl / "states.npy").as_posix(),
+            )
+        )
+        starts.extend((0, 0))
+        ends.extend((None, None))
+        if not trust_sync_messages:
+            npy_paths.append((continuous / "sample_numbers.npy").as_posix())
+            starts.append(0)
+            ends.append(_NPY_HEADER_PREFETCH_BYTES)
+    # async filesystems (e.g. s3fs) ignore `on_error` and always return exceptions in
+    # place of contents: ask all filesystems to do the same, and raise them here, with
+    # the path that failed, when they're reached
+    for path, contents in zip(
+        npy_paths, fs.cat_ranges(npy_paths, starts, ends, on_error="return")
+    ):
+        if isinstance(contents, FileNotFoundError):
+            raise FileNotFoundError(f"{path} not found") from contents
+        if isinstance(contents, BaseException):
+            raise OSError(f"Failed to read {path}") from contents
+        yield contents
+
+
+def _first_sample_from_prefetch(buffer: bytes, path: upath.UPath) -> int:
+    """First value in the .npy file at `path`, from a buffer holding the start of the
+    file - only read from `path` again if the buffer doesn't reach the first value."""
+    if _get_npy_array_start(buffer) <= len(buffer):
+        array_start, dtype, *_ = _parse_npy_header(buffer)
+        if array_start + dtype.itemsize <= len(buffer):
+            return np.frombuffer(
+                buffer, dtype=dtype, count=1, offset=array_start
+            ).item()
+    return read_array_range_from_npy(path, 0).item()
+
+
 def get_ephys_timing_on_pxi(
     recording_dirs: Iterable[npc_io.PathLike],
     only_devices_including: str | None = None,
+    trust_sync_messages: bool = False,
+    refresh: bool = False,
 ) -> Generator[EphysTimingInfoOnPXI, None, None]:
     """
+    - if `trust_sync_messages` is True, the first sample of each device is taken from
+      sync_messages.txt instead of continuous/sample_numbers.npy: this saves a read
+      per device, but the values can differ if Record Nodes were out-of-sync
+    - listings of `recording_dirs` are cached: use `refresh=True` if their contents may
+      have changed since they were last listed
+    - TTL data for all matching devices in a recording dir is fetched in one
+      concurrent batch before the first device is yielded: use `only_devices_including`
+      if only one device is needed
+    - if a device's files can't be read, devices before it are still yielded, then
+      an error naming the file is raised
+
     >>> path = upath.UPath('s3://aind-ephys-data/ecephys_670248_2023-08-03_12-04-15/ecephys_clipped/Record Node 102/experiment1/recording1')
     >>> next(get_ephys_timing_on_pxi(path)).sampling_rate
     30000.0
@@ -184,39 +366,51 @@ def get_ephys_timing_on_pxi(
         device_to_sync_messages_data = get_sync_messages_data(
             recording_dir / "sync_messages.txt"
         )  # includes name of each input device used (probe, nidaq)
-        for device in device_to_sync_messages_data:
-            if (
-                only_devices_including
-                and only_devices_including.lower() not in device.lower()
-            ):
-                continue
-            continuous = recording_dir / "continuous" / device
-            if not continuous.exists():
-                continue
-            events = recording_dir / "events" / device
-            ttl = next(events.glob("TTL*"))
+        device_to_paths = _get_device_paths(
+            recording_dir,
+            device_to_sync_messages_data,
+            only_devices_including,
+            refresh=refresh,
+        )
+        if not device_to_paths:
+            continue
+        npy_bytes = _cat_device_npy_files(
+            recording_dir.fs, device_to_paths, trust_sync_messages
+        )
 
-            first_sample_from_continuous_sample_numbers = read_array_range_from_npy(
-                continuous / "sample_numbers.npy", 0
-            ).item()
+        for device, (continuous, events, ttl) in device_to_paths.items():
+            ttl_sample_numbers_bytes = next(npy_bytes)
+            ttl_states_bytes = next(npy_bytes)
             first_sample_from_sync_messages = device_to_sync_messages_data[device][
                 "start"
             ]
-            if (
-                first_sample_from_continuous_sample_numbers
-                != first_sample_from_sync_messages
-            ):
-                logger.debug(
-                    f"{first_sample_from_sync_messages =} != {first_sample_from_continuous_sample_numbers =}. This may be due to Record Nodes being out-of-sync (green indicator in GUI). Using value from sample_numbers.npy"
+            if trust_sync_messages:
+                first_sample_on_ephys_clock = first_sample_from_sync_messages
+            else:
+                first_sample_from_continuous_sample_numbers = (
+                    _first_sample_from_prefetch(
+                        next(npy_bytes), continuous / "sample_numbers.npy"
+                    )
+                )
+                if (
+                    first_sample_from_continuous_sample_numbers
+                    != first_sample_from_sync_messages
+                ):
+                    logger.debug(
+                        f"{first_sample_from_sync_messages =} != {first_sample_from_continuous_sample_numbers =}. This may be due to Record Nodes being out-of-sync (green indicator in GUI). Using value from sample_numbers.npy"
+                    )
+                first_sample_on_ephys_clock = (
+                    first_sample_from_continuous_sample_numbers
                 )
-            first_sample_on_ephys_clock = first_sample_from_continuous_sample_numbers
 
             sampling_rate = device_to_sync_messages_data[device]["rate"]
             ttl_sample_numbers = (
-                np.load(io.BytesIO((ttl / "sample_numbers.npy").read_bytes()))
+                _array_from_npy_bytes(ttl_sample_numbers_bytes)
                 - first_sample_on_ephys_clock
             )
-            ttl_states = np.load(io.BytesIO((ttl / "states.npy").read_bytes()))
+            # states are small: copy into a mutable buffer so the array is writeable,
+            # like the array from `np.load`
+            ttl_states = _array_from_npy_bytes(bytearray(ttl_states_bytes))
             try:
                 compressed = clipped_path_to_compressed(continuous)
             except ValueError:
@@ -246,79 +440,189 @@ def clipped_path_to_compressed(path: npc_io.PathLike) -> upath.UPath:
     path = npc_io.from_pathlike(path)
     if "ecephys_clipped" not in path.as_posix():
         raise ValueError(f'Expected path to contain "ecephys_clipped", got {path}')
-    experiment_re = re.search(r".*(experiment\d+)", path.as_posix())
-    record_node_re = re.search(r".*(Record Node \d+)", path.as_posix())
+    experiment_re = _EXPERIMENT_RE.search(path.as_posix())
+    record_node_re = _RECORD_NODE_RE.search(path.as_posix())
     # /recording?/ isn't part of compressed path: assumes 1 recording per folder, or concats multiple recordings
     if not (experiment_re and record_node_re):
         raise ValueError(f"Could not parse experiment and record node from {path}")
     experiment, record_node = experiment_re.groups()[0], record_node_re.groups()[0]
-    device_re = re.match(
-        rf".*{record_node}/{experiment}/recording\d+/[^/]+/(.*)", path.as_posix()
-    )
+    device_re = _get_device_re(record_node, experiment).match(path.as_posix())
     if not device_re:
         raise ValueError(f"Could not parse device from {path}")
     compressed_name = f"{experiment}_{record_node}#{device_re.groups()[0]}.zarr"
     root_path = next(p for p in path.parents if p.name == "ecephys_clipped")
-    # cannot construct S3Path de novo from a string including `#`, but we can return
-    # the actual path that exists
-    compressed_path = next(
+    compressed_dir = root_path.with_name("ecephys_compressed")
+    if compressed_name not in _get_dir_contents(compressed_dir):
+        # cached listing may be out-of-date (e.g. data uploaded since): list again
+        if compressed_name not in _get_dir_contents(compressed_dir, refresh=True):
+            raise FileNotFoundError(f"Could not find {compressed_name} in {root_path}")
+    # cannot construct S3Path de novo from a string including `#`, but we can join
+    # the name to an existing path
+    return compressed_dir / compressed_name
+
+
+@functools.lru_cache(maxsize=32)
+def _get_device_re(record_node: str, experiment: str) -> re.Pattern[str]:
+    return re.compile(rf".*{record_node}/{experiment}/recording\d+/[^/]+/(.*)")
+
+
+def _get_dir_contents(path: upath.UPath, refresh: bool = False) -> set[str]:
+    """Names of items in a directory, listed once per directory (e.g.
+    `ecephys_compressed`, which is shared by all devices).
+
+    - use `refresh=True` to list `path` again: cached listings of other directories
+      are kept
+    """
+    names = _get_dir_contents_cached(path.as_posix(), path.fs)
+    if refresh:
+        # update the cached set in place, as lru_cache can't replace a single entry
+        names.clear()
+        names.update(_ls_names(path.as_posix(), path.fs, refresh=True))
+    return names
+
+
+@functools.lru_cache(maxsize=32)
+def _get_dir_contents_cached(path: str, fs: fsspec.AbstractFileSystem) -> set[str]:
+    return _ls_names(path, fs)
+
+
+def _ls_names(
+    path: str, fs: fsspec.AbstractFileSystem, refresh: bool = False
+) -> set[str]:
+    # `refresh` also bypasses fsspec's own listings cache, where there is one
+    return {
+        p.rstrip("/").rsplit("/", 1)[-1]
+        for p in fs.ls(path, detail=False, refresh=refresh)
+    }
+
+
+class _DatStore(MutableMapping):
+    """Read-only zarr v2 store that presents a raw `continuous.dat` file
+    (int16, samples x channels) as an uncompressed array, with each chunk of
+    samples fetched from the file with a ranged read when accessed."""
+
+    def __init__(
+        self, path: upath.UPath, num_channels: int, chunk_samples: int = 10_000
+    ) -> None:
+        self.path = path
+        self.num_channels = num_channels
+        self.chunk_samples = chunk_samples
+        self.itemsize = np.dtype(np.int16).itemsize
+        self.size = path.fs.size(path.as_posix())
+        self.num_samples = self.size // (self.itemsize * num_channels)
+        self.num_chunks = -(-self.num_samples // chunk_samples)
+        self.zarray = json.dumps(
+            {
+                "zarr_format": 2,
+                "shape": [self.num_samples, num_channels],
+                "chunks": [chunk_samples, num_channels],
+                "dtype": np.dtype(np.int16).str,
+                "compressor": None,
+                "fill_value": 0,
+                "order": "C",
+                "filters": None,
+            }
+        ).encode()
+
+    def __getitem__(self, key: str) -> bytes:
+        if key == ".zarray":
+            return self.zarray
+        try:
+            chunk_idx, channel_chunk_idx = (int(i) for i in key.split("."))
+        except ValueError:
+            raise KeyError(key) from None
+        if channel_chunk_idx != 0 or not 0 <= chunk_idx < self.num_chunks:
+            raise KeyError(key)
+        chunk_size = self.chunk_samples * self.num_channels * self.itemsize
+        start = chunk_idx * chunk_size
+        data = self.path.fs.cat_file(
+            self.path.as_posix(), start=start, end=min(start + chunk_size, self.size)
+        )
+        # zarr expects complete chunks: pad the last one
+        return data.ljust(chunk_size, b"\0")
+
+    def __iter__(self) -> Iterator[str]:
+        yield ".zarray"
+        yield from (f"{i}.0" for i in range(self.num_chunks))
+
+    def __len__(self) -> int:
+        return self.num_chunks + 1
+
+    def __setitem__(self, key: str, value: bytes) -> None:
+        raise PermissionError(f"{self.__class__.__name__} is read-only")
+
+    def __delitem__(self, key: str) -> None:
+        raise PermissionError(f"{self.__class__.__name__} is read-only")
+
+
+def _get_num_channels(device_name: str, *recording_dirs: npc_io.PathLike) -> int:
+    """Number of channels for device, from `structure.oebin` files in recording dirs."""
+    device_metadata = next(
         (
-            path
-            for path in root_path.with_name("ecephys_compressed").iterdir()
-            if path.name == compressed_name
+            _
+            for _ in get_merged_oebin_file(
+                next(npc_io.from_pathlike(p).glob("*.oebin")) for p in recording_dirs
+            )["continuous"]
+            if device_name in _["folder_name"]
         ),
         None,
     )
-    if compressed_path is None:
-        raise FileNotFoundError(f"Could not find {compressed_name} in {root_path}")
-    return compressed_path
+    if device_metadata is None:
+        raise ValueError(
+            f"Could not find device metadata for {device_name}: looked for `structure.oebin` files in {recording_dirs}"
+        )
+    return device_metadata["num_channels"]
+
+
+def _get_num_samples(device: EphysDeviceInfo) -> int:
+    """Number of samples in device's data, from zarr metadata or the size of
+    continuous.dat, without opening the data itself."""
+    if device.compressed:
+        zarray = json.loads(
+            (device.compressed / "traces_seg0" / ".zarray").read_bytes()
+        )
+        return zarray["shape"][0]
+    dat = device.continuous / "continuous.dat"
+    num_channels = _get_num_channels(device.name, device.continuous.parent.parent)
+    return dat.fs.size(dat.as_posix()) // (np.dtype(np.int16).itemsize * num_channels)
 
 
 def get_ephys_data(
     *recording_dirs: npc_io.PathLike,
     device: str | EphysDeviceInfo,
+    trust_sync_messages: bool = False,
 ) -> npt.NDArray[np.int16]:
+    # resolve paths once: functions called below return UPaths as-is
+    recording_dirs = tuple(npc_io.from_pathlike(p) for p in recording_dirs)
     if not isinstance(device, EphysDeviceInfo):
         device = next(
-            get_ephys_timing_on_pxi(recording_dirs, only_devices_including=device)
+            get_ephys_timing_on_pxi(
+                recording_dirs,
+                only_devices_including=device,
+                trust_sync_messages=trust_sync_messages,
+            )
         ).device
     if device.compressed:
         data = zarr.open(device.compressed, mode="r")
         return data["traces_seg0"]
     else:
-        device_metadata = next(
-            (
-                _
-                for _ in get_merged_oebin_file(
-                    next(npc_io.from_pathlike(p).glob("*.oebin"))
-                    for p in recording_dirs
-                )["continuous"]
-                if device.name in _["folder_name"]
-            ),
-            None,
-        )
-        if device_metadata is None:
-            raise ValueError(
-                f"Could not find device metadata for {device.name}: looked for `structure.oebin` files in {recording_dirs}"
-            )
-        num_channels: int = device_metadata["num_channels"]
-
+        num_channels = _get_num_channels(device.name, *recording_dirs)
         if not device.continuous.as_uri().startswith("file"):
-            # local file we can memory-map
-            dat = np.load(device.continuous / "continuous.dat", mmap_mode="r")
-        else:
-            logger.warning(
-                f"Reading entirety of uncompressed OpenEphys data from {device.continuous}. If you only need part of this data, consider using `read_array_range_from_npy` with the path instead."
+            # remote file: fetch chunks of samples on demand, instead of downloading
+            # the entire file
+            return zarr.open(
+                _DatStore(device.continuous / "continuous.dat", num_channels),
+                mode="r",
             )
-            dat = np.frombuffer(
-                (device.continuous / "continuous.dat").read_bytes(), dtype=np.int16
-            )
-        return np.reshape(dat, (int(dat.size / num_channels), -1))
+        # local file we can memory-map: raw binary, so shape comes from num_channels
+        dat = np.memmap(device.continuous / "continuous.dat", dtype=np.int16, mode="r")
+        return dat.reshape(-1, num_channels)
 
 
 def get_pxi_nidaq_data(
     *recording_dirs: npc_io.PathLike,
     device_name: str | None = None,
+    trust_sync_messages: bool = False,
 ) -> npt.NDArray[np.int16]:
     """
     -channel_idx: 0-indexed
@@ -332,17 +636,26 @@ def get_pxi_nidaq_data(
     >>> get_pxi_nidaq_data(path).shape
     (142823472, 8)
     """
+    # resolve paths once: functions called below return UPaths as-is
+    recording_dirs = tuple(npc_io.from_pathlike(p) for p in recording_dirs)
     if device_name:
         device = next(
-            get_ephys_timing_on_pxi(recording_dirs, only_devices_including=device_name)
+            get_ephys_timing_on_pxi(
+                recording_dirs,
+                only_devices_including=device_name,
+                trust_sync_messages=trust_sync_messages,
+            )
         ).device
     else:
-        device = get_pxi_nidaq_info(recording_dirs).device
+        device = get_pxi_nidaq_info(
+            recording_dirs, trust_sync_messages=trust_sync_messages
+        ).device
     return get_ephys_data(*recording_dirs, device=device)
 
 
 def get_pxi_nidaq_info(
     recording_dir: Iterable[npc_io.PathLike],
+    trust_sync_messages: bool = False,
 ) -> EphysTimingInfoOnPXI:
     """NI-DAQmx device info
 
@@ -353,7 +666,9 @@ def get_pxi_nidaq_info(
     info = tuple(
         t
         for t in get_ephys_timing_on_pxi(
-            recording_dir, only_devices_including="NI-DAQmx-"
+            recording_dir,
+            only_devices_including="NI-DAQmx-",
+            trust_sync_messages=trust_sync_messages,
         )
     )
     if not info:
@@ -411,15 +726,16 @@ def get_ephys_timing_on_sync(
 
     assert devices is not None
     for info in devices:
+        # times are converted to seconds once per device, then masked: states are +ve
+        # for rising edges, -ve for falling
+        ttl_times = info.ttl_times
         (
             ephys_barcode_times,
             ephys_barcode_ids,
         ) = npc_ephys.barcodes.extract_barcodes_from_times(
-            on_times=info.device.ttl_sample_numbers[info.device.ttl_states > 0]
-            / info.sampling_rate,
-            off_times=info.device.ttl_sample_numbers[info.device.ttl_states < 0]
-            / info.sampling_rate,
-            total_time_on_line=info.device.ttl_sample_numbers[-1] / info.sampling_rate,
+            on_times=ttl_times[info.device.ttl_states > 0],
+            off_times=ttl_times[info.device.ttl_states < 0],
+            total_time_on_line=ttl_times[-1],
         )
 
         timeshift, sampling_rate, _ = npc_ephys.barcodes.get_probe_time_offset(
@@ -459,14 +775,58 @@ def is_new_ephys_folder(path: npc_io.PathLike) -> bool:
     return False
 
 
-def is_complete_ephys_folder(path: npc_io.PathLike) -> bool:
+def _walk(path: upath.UPath, refresh: bool = False) -> dict[str, int]:
+    """Sizes (bytes) of all files in `path` and its subfolders, keyed on posix path
+    relative to `path`.
+
+    - a single `find` is much faster than repeated `rglob` calls on remote storage
+    - results are cached per path: use `refresh=True` to clear the cache and list
+      again
+    """
+    if refresh:
+        _find.cache_clear()
+    return _find(path.as_posix(), path.fs)
+
+
+@functools.lru_cache(maxsize=64)
+def _find(path: str, fs: fsspec.AbstractFileSystem) -> dict[str, int]:
+    root = fs._strip_protocol(path).rstrip("/")
+    return {
+        p[len(root) :].lstrip("/"): info.get("size") or 0
+        for p, info in fs.find(path, detail=True).items()
+    }
+
+
+def _get_size(path: upath.UPath, subfolder: upath.UPath) -> int:
+    """Total size (bytes) of files in `subfolder`, which must be within `path`,
+    using the cached listing of `path`."""
+    relative_dir = subfolder.as_posix()[len(path.as_posix()) :].strip("/")
+    prefix = f"{relative_dir}/" if relative_dir else ""
+    return sum(
+        size
+        for relative_path, size in _walk(path).items()
+        if relative_path.startswith(prefix)
+    )
+
+
+def _rglob(
+    path: upath.UPath, pattern: str, refresh: bool = False
+) -> Generator[upath.UPath, None, None]:
+    """Equivalent to `path.rglob(pattern)` for files, using the cached listing of
+    `path`."""
+    for relative_path in _walk(path, refresh=refresh):
+        if fnmatch.fnmatch(relative_path.rsplit("/", 1)[-1], pattern):
+            yield path / relative_path
+
+
+def is_complete_ephys_folder(path: npc_io.PathLike, refresh: bool = False) -> bool:
     """Look for all hallmarks of a complete v0.6.x Open Ephys recording."""
     # TODO use structure.oebin to check for completeness
     path = npc_io.from_pathlike(path)
     if not is_new_ephys_folder(path):
         return False
     for glob in ("continuous.dat", "spike_times.npy", "spike_clusters.npy"):
-        if not next(path.rglob(glob), None):
+        if not next(_rglob(path, glob, refresh=refresh), None):
             logger.debug(f"Could not find {glob} in {path}")
             return False
     return True
@@ -561,19 +921,23 @@ def get_filtered_ephys_paths_relative_to_record_node_parents(
             f"Found {len(superfluous_recording_dirs)} superfluous recording dirs to exclude: {superfluous_recording_dirs}"
         )
 
+        # string prefix checks are much cheaper than comparing against every parent
+        # path of every file
+        superfluous_prefixes = tuple(
+            f"{_.as_posix().rstrip('/')}/" for _ in superfluous_recording_dirs
+        )
+        record_node_parent = record_node.parent
         for abs_path in record_node.rglob("*"):
-            is_superfluous_path = any(
-                _ in abs_path.parents for _ in superfluous_recording_dirs
-            )
-
-            if is_superfluous_path:
+            if abs_path.as_posix().startswith(superfluous_prefixes):
                 continue
 
-            yield abs_path, abs_path.relative_to(record_node.parent)
+            yield abs_path, abs_path.relative_to(record_node_parent)
 
 
 def get_raw_ephys_subfolders(
-    path: npc_io.PathLike, min_size_gb: int | float | None = None
+    path: npc_io.PathLike,
+    min_size_gb: int | float | None = None,
+    refresh: bool = False,
 ) -> tuple[upath.UPath, ...]:
     """
     Return raw ephys recording folders, defined as the root that Open Ephys
@@ -583,7 +947,7 @@ def get_raw_ephys_subfolders(
 
     subfolders = set()
 
-    for f in upath.UPath(path).rglob("continuous.dat"):
+    for f in _rglob(path, "continuous.dat", refresh=refresh):
         if any(
             k in f.as_posix().lower()
             for k in [
@@ -608,7 +972,7 @@ def get_raw_ephys_subfolders(
 # - If we have probeABC and probeDEF raw data folders, each one has an oebin file:
 #     we'll need to merge the oebin files and the data folders to create a single session
 #     that can be processed in parallel
-def get_single_oebin_path(path: npc_io.PathLike) -> upath.UPath:
+def get_single_oebin_path(path: npc_io.PathLike, refresh: bool = False) -> upath.UPath:
     """Get the path to a single structure.oebin file in a folder of raw ephys data.
 
     - There's one structure.oebin per `recording*` folder
@@ -621,7 +985,7 @@ def get_single_oebin_path(path: npc_io.PathLike) -> upath.UPath:
     if not path.is_dir():
         raise ValueError(f"{path} is not a directory")
 
-    oebin_paths = tuple(path.rglob("structure*.oebin"))
+    oebin_paths = tuple(_rglob(path, "structure*.oebin", refresh=refresh))
 
     if not oebin_paths:
         raise FileNotFoundError(f"No structure.oebin file found in {path}")
@@ -629,24 +993,26 @@ def get_single_oebin_path(path: npc_io.PathLike) -> upath.UPath:
     if len(oebin_paths) == 1:
         return oebin_paths[0]
 
-    oebin_parents = (_.parent for _ in oebin_paths)
-    dir_sizes = tuple(npc_io.get_size(_) for _ in oebin_parents)
-    return oebin_paths[dir_sizes.index(max(dir_sizes))]
+    # sizes from the listing of `path` we already have, instead of walking each dir again
+    return max(oebin_paths, key=lambda p: _get_size(path, p.parent))
 
 
-def get_superfluous_oebin_paths(path: npc_io.PathLike) -> tuple[upath.UPath, ...]:
+def get_superfluous_oebin_paths(
+    path: npc_io.PathLike, refresh: bool = False
+) -> tuple[upath.UPath, ...]:
     """Get the paths to any oebin files in `recording*` folders that are not
     the largest in a folder of raw ephys data.
 
     Companion to `get_single_oebin_path`.
     """
     path = npc_io.from_pathlike(path)
-    all_oebin_paths = tuple(path.rglob("structure*.oebin"))
+    all_oebin_paths = tuple(_rglob(path, "structure*.oebin", refresh=refresh))
 
     if len(all_oebin_paths) == 1:
         return ()
 
-    return tuple(set(all_oebin_paths) - {(get_single_oebin_path(path))})
+    # listing of `path` is cached now, so no need to refresh again
+    return tuple(set(all_oebin_paths) - {get_single_oebin_path(path)})
 
 
 def assert_xml_files_match(*path: npc_io.PathLike) -> None:
@@ -695,6 +1061,8 @@ def get_merged_oebin_file(
 
     logger.debug(f"Creating merged oebin file from {oebin_paths}")
     merged_oebin: dict = {}
+    # identifiers of items already in merged oebin, for fast lookup
+    key_to_item_ids: dict[str, set[str]] = {}
     for oebin_path in sorted(oebin_paths):
         oebin_data = get_oebin_data(oebin_path)
 
@@ -705,9 +1073,13 @@ def get_merged_oebin_file(
 
             # 'continuous', 'events', 'spikes' are lists, which we want to concatenate across files
             if isinstance(oebin_data[key], list):
+                item_ids = key_to_item_ids.setdefault(key, set())
                 for item in oebin_data[key]:
                     # skip if already in merged oebin
-                    if item in merged_oebin.get(key, []):
+                    item_id = item.get("folder_name") or json.dumps(
+                        item, sort_keys=True
+                    )
+                    if item_id in item_ids:
                         continue
 
                     # skip probes in excl list (ie. not inserted)
@@ -719,6 +1091,7 @@ def get_merged_oebin_file(
 
                     # insert in merged oebin
                     merged_oebin.setdefault(key, []).append(item)
+                    item_ids.add(item_id)
 
     if not merged_oebin:
         raise ValueError("No data found in structure.oebin files")
@@ -728,7 +1101,14 @@ def get_merged_oebin_file(
 def get_oebin_data(
     path: npc_io.PathLike,
 ) -> dict[Literal["continuous", "events", "spikes"], list[dict[str, Any]]]:
-    return json.loads(npc_io.from_pathlike(path).read_text())
+    path = npc_io.from_pathlike(path)
+    # parse cached contents on each call so that callers get a new dict they can modify
+    return json.loads(_read_bytes_cached(path.as_posix(), path.fs))
+
+
+@functools.lru_cache(maxsize=256)
+def _read_bytes_cached(path: str, fs: fsspec.AbstractFileSystem) -> bytes:
+    return fs.cat_file(path)
 
 
 def validate_recording_folder(
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+import npc_ephys.barcodes
+
+
+def _extract_barcodes_from_times_reference(
+    on_times,
+    off_times,
+    inter_barcode_interval=29,
+    bar_duration=0.015,
+    barcode_duration_ceiling=2,
+    nbits=32,
+    total_time_on_line=None,
+):
+    """Original implementation, which masks all edges for every barcode."""
+    if len(on_times) > len(off_times):
+        on_times = on_times[:-1]
+
+    a = np.where(np.diff(on_times) > inter_barcode_interval)[0]
+    if on_times[0] > barcode_duration_ceiling:
+        a = np.insert(a, 0, -1)
+    barcode_start_times = on_times[a + 1]
+
+    if (
+        total_time_on_line is not None
+        and total_time_on_line - off_times[-1] < barcode_duration_ceiling
+    ):
+        off_times = off_times[:-1]
+
+    barcodes = []
+    for t in barcode_start_times:
+        oncode = on_times[(on_times > t) & (on_times < t + barcode_duration_ceiling)]
+        offcode = off_times[
+            (off_times > t) & (off_times < t + barcode_duration_ceiling)
+        ]
+        curr_time = offcode[0]
+        bits = np.zeros((nbits,))
+        for bit in range(nbits):
+            next_on = oncode[oncode > curr_time]
+            next_off = offcode[offcode > curr_time]
+            next_on = next_on[0] if next_on.size else t + inter_barcode_interval
+            next_off = next_off[0] if next_off.size else t + inter_barcode_interval
+            if next_on < next_off:
+                bits[bit] = 1
+            curr_time += bar_duration
+        barcodes.append(sum(bits[bit] * pow(2, bit) for bit in range(nbits)))
+    return barcode_start_times, np.array(barcodes, dtype=np.int64)
+
+
+def _random_barcode_train(rng, nbits=32, bar_duration=0.03):
+    """Rising and falling edge times for a sequence of random barcodes, each an
+    initial pulse followed by `nbits` bars, least significant bit first."""
+    on_times: list[float] = []
+    off_times: list[float] = []
+    t = rng.uniform(0, 5)
+    for _ in range(rng.integers(1, 20)):
+        on_times.append(t)
+        off_times.append(t + 0.02)
+        bar_start = t + 0.04
+        previous_bit = 0
+        for bit in rng.integers(0, 2, nbits):
+            if bit and not previous_bit:
+                on_times.append(bar_start)
+            elif previous_bit and not bit:
+                off_times.append(bar_start)
+            previous_bit = bit
+            bar_start += bar_duration
+        if previous_bit:
+            off_times.append(bar_start)
+        t += rng.uniform(30, 32)
+    return np.array(on_times), np.array(off_times), t
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_extract_barcodes_from_times_matches_reference(seed):
+    rng = np.random.default_rng(seed)
+    on_times, off_times, end_time = _random_barcode_train(rng)
+    # sometimes end the recording just after the last barcode, so it's discarded
+    total_time_on_line = end_time - rng.uniform(29, 30) if seed % 2 else None
+
+    start_times, barcodes = npc_ephys.barcodes.extract_barcodes_from_times(
+        on_times, off_times, total_time_on_line=total_time_on_line
+    )
+    expected_start_times, expected_barcodes = _extract_barcodes_from_times_reference(
+        on_times, off_times, total_time_on_line=total_time_on_line
+    )
+    assert np.array_equal(start_times, expected_start_times)
+    assert np.array_equal(barcodes, expected_barcodes)
@@ -0,0 +1,262 @@
+import io
+import json
+
+import fsspec.implementations.memory
+import numpy as np
+import pytest
+import upath
+import zarr
+
+import npc_ephys.openephys
+
+ARRAYS = {
+    "1d": np.arange(-50, 50, dtype="<i8"),
+    "2d_c_order": np.arange(24, dtype="<f4").reshape(4, 6),
+    "2d_fortran_order": np.asfortranarray(np.arange(24, dtype=">i2").reshape(4, 6)),
+    "large_header": np.zeros(3, dtype=[(f"field{i}", "<f4") for i in range(400)]),
+}
+
+
+@pytest.mark.parametrize("version", [(1, 0), (2, 0), (3, 0)])
+@pytest.mark.parametrize("name", ARRAYS)
+def test_npy_header_roundtrip(tmp_path, name, version):
+    array = ARRAYS[name]
+    path = upath.UPath(tmp_path / f"{name}.npy")
+    with path.open("wb") as f:
+        np.lib.format.write_array(f, array, version=version)
+    contents = path.read_bytes()
+    if name == "large_header":
+        assert npc_ephys.openephys._get_npy_array_start(contents) > (
+            npc_ephys.openephys._NPY_HEADER_PREFETCH_BYTES
+        )
+
+    array_start, dtype, shape, fortran_order = npc_ephys.openephys._read_npy_header(
+        path
+    )
+    assert array_start == len(contents) - array.nbytes
+    assert dtype == array.dtype
+    assert shape == array.shape
+    assert fortran_order == (array.flags.f_contiguous and not array.flags.c_contiguous)
+
+    assert np.array_equal(
+        npc_ephys.openephys._array_from_npy_bytes(contents),
+        np.load(io.BytesIO(contents)),
+    )
+
+
+def test_read_array_range_from_npy(tmp_path):
+    array = ARRAYS["1d"]
+    path = upath.UPath(tmp_path / "1d.npy")
+    np.save(path, array)
+    assert npc_ephys.openephys.read_array_range_from_npy(path, 0).item() == array[0]
+    assert np.array_equal(
+        npc_ephys.openephys.read_array_range_from_npy(path, slice(10, 20)),
+        array[10:20],
+    )
+
+
+def test_array_from_npy_bytes_writeable():
+    buffer = io.BytesIO()
+    np.save(buffer, ARRAYS["1d"])
+    contents = buffer.getvalue()
+    assert not npc_ephys.openephys._array_from_npy_bytes(contents).flags.writeable
+    assert npc_ephys.openephys._array_from_npy_bytes(
+        bytearray(contents)
+    ).flags.writeable
+
+
+@pytest.mark.parametrize("protocol", ["file", "memory"])
+def test_get_ephys_data_from_dat(tmp_path, protocol):
+    device = "Neuropix-PXI-100.ProbeA-AP"
+    num_channels = 4
+    # not a multiple of the chunk size, so the last chunk is partial
+    num_samples = 25_003
+    recording_dir = upath.UPath(
+        tmp_path if protocol == "file" else f"memory://{tmp_path.name}/recording1"
+    )
+    (recording_dir / "sync_messages.txt").write_text(
+        "Software Time (milliseconds since midnight Jan 1st 1970 UTC): 0\n"
+        "Start Time for Neuropix-PXI (100) - ProbeA-AP @ 30000 Hz: 0\n"
+    )
+    (recording_dir / "structure.oebin").write_text(
+        json.dumps(
+            {
+                "continuous": [
+                    {"folder_name": f"{device}/", "num_channels": num_channels}
+                ]
+            }
+        )
+    )
+    continuous = recording_dir / "continuous" / device
+    ttl = recording_dir / "events" / device / "TTL"
+    for path, array in {
+        continuous / "sample_numbers.npy": np.arange(num_samples),
+        ttl / "sample_numbers.npy": np.arange(0, num_samples, 1000),
+        ttl / "states.npy": np.ones(26, dtype=np.int16),
+    }.items():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as f:
+            np.save(f, array)
+    dat = np.random.default_rng(0).integers(
+        -(2**15), 2**15, size=(num_samples, num_channels), dtype=np.int16
+    )
+    (continuous / "continuous.dat").write_bytes(dat.tobytes())
+    dat_copy = tmp_path / "continuous_copy.dat"
+    dat_copy.write_bytes(dat.tobytes())
+
+    data = npc_ephys.openephys.get_ephys_data(recording_dir, device="ProbeA")
+    # non-local files are read in chunks via zarr, local files are memory-mapped
+    assert isinstance(data, zarr.Array) == (protocol != "file")
+    assert data.shape == (num_samples, num_channels)
+    assert np.array_equal(
+        data[:], np.fromfile(dat_copy, dtype=np.int16).reshape(-1, num_channels)
+    )
+
+
+class _ReturnExceptionsFileSystem(fsspec.implementations.memory.MemoryFileSystem):
+    """Like async filesystems (e.g. s3fs), which ignore `on_error` in `cat_ranges`."""
+
+    def cat_ranges(self, paths, starts, ends, max_gap=None, **kwargs):
+        kwargs["on_error"] = "return"
+        return super().cat_ranges(paths, starts, ends, max_gap, **kwargs)
+
+
+def test_cat_device_npy_files_raises_for_missing_file(tmp_path):
+    ttl = upath.UPath(f"memory://{tmp_path.name}/events/device/TTL")
+    ttl.mkdir(parents=True)
+    with (ttl / "sample_numbers.npy").open("wb") as f:
+        np.save(f, np.arange(10))
+    npy_bytes = npc_ephys.openephys._cat_device_npy_files(
+        _ReturnExceptionsFileSystem(),
+        {"device": (ttl.parent, ttl.parent, ttl)},
+        trust_sync_messages=True,
+    )
+    assert np.array_equal(
+        npc_ephys.openephys._array_from_npy_bytes(next(npy_bytes)), np.arange(10)
+    )
+    with pytest.raises(FileNotFoundError, match="states.npy"):
+        next(npy_bytes)
+
+
+def _write_recording(recording_dir, probes, exclude=()):
+    """sync_messages.txt and .npy files for each probe, except any paths (relative to
+    `recording_dir`) in `exclude`."""
+    (recording_dir / "sync_messages.txt").write_text(
+        "Software Time (milliseconds since midnight Jan 1st 1970 UTC): 0\n"
+        + "".join(
+            f"Start Time for Neuropix-PXI (100) - Probe{probe}-AP @ 30000 Hz: 0\n"
+            for probe in probes
+        )
+    )
+    for probe in probes:
+        device = f"Neuropix-PXI-100.Probe{probe}-AP"
+        for relative_path in (
+            f"continuous/{device}/sample_numbers.npy",
+            f"events/{device}/TTL/sample_numbers.npy",
+            f"events/{device}/TTL/states.npy",
+        ):
+            if relative_path.startswith(tuple(exclude)):
+                continue
+            path = recording_dir / relative_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("wb") as f:
+                np.save(f, np.arange(10))
+
+
+def test_get_ephys_timing_on_pxi_yields_devices_before_missing_file(tmp_path):
+    recording_dir = upath.UPath(f"memory://{tmp_path.name}/recording1")
+    _write_recording(
+        recording_dir,
+        "AB",
+        exclude=["events/Neuropix-PXI-100.ProbeB-AP/TTL/states.npy"],
+    )
+    timing = npc_ephys.openephys.get_ephys_timing_on_pxi(recording_dir)
+    assert next(timing).device.name == "Neuropix-PXI-100.ProbeA-AP"
+    with pytest.raises(FileNotFoundError, match="ProbeB-AP/TTL/states.npy"):
+        next(timing)
+
+
+def test_get_ephys_timing_on_pxi_skips_devices_without_ttl(tmp_path):
+    recording_dir = upath.UPath(f"memory://{tmp_path.name}/recording1")
+    _write_recording(
+        recording_dir, "ABC", exclude=["events/Neuropix-PXI-100.ProbeB-AP"]
+    )
+    assert [
+        timing.device.name
+        for timing in npc_ephys.openephys.get_ephys_timing_on_pxi(recording_dir)
+    ] == ["Neuropix-PXI-100.ProbeA-AP", "Neuropix-PXI-100.ProbeC-AP"]
+
+
+def test_clipped_path_to_compressed_lists_again_on_miss(tmp_path):
+    session = upath.UPath(f"memory://{tmp_path.name}/ecephys_session")
+    device = "Neuropix-PXI-100.ProbeA-AP"
+    clipped = (
+        session
+        / "ecephys_clipped/Record Node 102/experiment1/recording1/continuous"
+        / device
+    )
+    compressed_dir = session / "ecephys_compressed"
+    (compressed_dir / "other.zarr" / ".zgroup").write_text("{}")
+    with pytest.raises(FileNotFoundError):
+        npc_ephys.openephys.clipped_path_to_compressed(clipped)
+
+    # uploaded after the directory was listed
+    compressed_name = f"experiment1_Record Node 102#{device}.zarr"
+    (compressed_dir / compressed_name / ".zgroup").write_text("{}")
+    compressed = npc_ephys.openephys.clipped_path_to_compressed(clipped)
+    assert compressed.name == compressed_name
+    assert compressed.exists()
+
+
+def _write_files(root, relative_path_to_size):
+    for relative_path, size in relative_path_to_size.items():
+        path = root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(bytes(size))
+
+
+def test_oebin_paths_with_multiple_recordings(tmp_path):
+    record_node = upath.UPath(tmp_path / "Record Node 102")
+    recordings = record_node / "experiment1"
+    dat = "continuous/Neuropix-PXI-100.ProbeA-AP/continuous.dat"
+    _write_files(
+        recordings,
+        {
+            "recording1/structure.oebin": 10,
+            f"recording1/{dat}": 100,
+            "recording2/structure.oebin": 10,
+            f"recording2/{dat}": 1000,
+            "recording2/spike_times.npy": 10,
+            "recording2/spike_clusters.npy": 10,
+            "recording3/structure.oebin": 10,
+        },
+    )
+    assert set(npc_ephys.openephys._rglob(record_node, "continuous.dat")) == {
+        recordings / f"recording{i}" / dat for i in (1, 2)
+    }
+    assert npc_ephys.openephys.get_single_oebin_path(record_node) == (
+        recordings / "recording2" / "structure.oebin"
+    )
+    assert set(npc_ephys.openephys.get_superfluous_oebin_paths(record_node)) == {
+        recordings / f"recording{i}" / "structure.oebin" for i in (1, 3)
+    }
+    assert npc_ephys.openephys.is_complete_ephys_folder(record_node)
+    assert not npc_ephys.openephys.is_complete_ephys_folder(recordings / "recording1")
+
+
+def test_oebin_paths_with_top_level_oebin(tmp_path):
+    # files in subfolders count towards the size of the top level
+    path = upath.UPath(tmp_path / "Record Node 102")
+    _write_files(
+        path,
+        {
+            "structure.oebin": 10,
+            "continuous.dat": 10,
+            "recording1/structure.oebin": 10,
+            "recording1/continuous.dat": 1000,
+        },
+    )
+    assert npc_ephys.openephys.get_single_oebin_path(path) == path / "structure.oebin"
+    assert npc_ephys.openephys.get_superfluous_oebin_paths(path) == (
+        path / "recording1" / "structure.oebin",
+    )